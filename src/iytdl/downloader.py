@@ -27,6 +27,8 @@ logger = logging.getLogger(__name__)
 
 
 class Downloader:
+    __slots__ = ()
+
     async def video_downloader(
         self, url: str, uid: str, rnd_key: str, prog_func: Callable
     ) -> Union[int, str]:
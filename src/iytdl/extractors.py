@@ -22,6 +22,8 @@ logger = logging.getLogger(__name__)
 
 
 class Extractor:
+    __slots__ = ("silent",)
+
     def __init__(self, silent: bool = False) -> None:
         self.silent = silent
 
@@ -1,29 +1,96 @@
 __all__ = ["iYTDL"]
 
 import asyncio
-import hashlib
 import re
+import string
 
 from pathlib import Path, WindowsPath
-from typing import Optional, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
 
-from aiohttp import ClientSession
-from html_telegraph_poster import TelegraphPoster
-from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto
+from aiohttp import ClientSession, TCPConnector
 
 from iytdl import types
-from iytdl.constants import YT_VID_URL
 from iytdl.downloader import Downloader
 from iytdl.exceptions import *  # noqa ignore=F405
 from iytdl.extractors import Extractor
-from iytdl.formatter import ResultFormatter, gen_search_markup
 from iytdl.sql_cache import AioSQLiteDB
-from iytdl.types import Buttons
 from iytdl.upload_lib.uploader import Uploader
-from iytdl.utils import run_command, run_sync
+from iytdl.utils import is_url, run_command
+
+
+_YT_LINK_RE = re.compile(
+    r"(?:youtube(?:-nocookie)?\.com/(?:watch\?v=|embed/|v/|shorts/)|youtu\.be/)"
+    r"([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])"
+)
+_YT_ID_CHARS = frozenset(string.ascii_letters + string.digits + "-_")
+_YT_LINK_PREFIXES = tuple(
+    f"{host}/{path}"
+    for host in ("youtube.com", "youtube-nocookie.com")
+    for path in ("watch?v=", "embed/", "v/", "shorts/")
+) + ("youtu.be/",)
+# Best to worst
+_YT_THUMB_QUALITIES = (
+    "maxresdefault",
+    "hqdefault",
+    "sddefault",
+    "mqdefault",
+    "default",
+)
+# Max connections to a single host e.g i.ytimg.com
+_LIMIT_PER_HOST = 30
+
+
+def _extract_yt_id(text: str) -> Optional[str]:
+    """Scan text for a YouTube link without regex, same as `_YT_LINK_RE`
+
+    Parameters:
+    ----------
+        - text (`str`): Text containing YouTube link.
+
+    Returns:
+    -------
+        `Optional[str]`: YouTube video ID of the first link
+    """
+    if "youtu" not in text:
+        return
+    best: Optional[Tuple[int, str]] = None
+    for prefix in _YT_LINK_PREFIXES:
+        start = text.find(prefix)
+        while start != -1 and (best is None or start < best[0]):
+            pos = start + len(prefix)
+            yt_id = text[pos : pos + 11]
+            if (
+                len(yt_id) == 11
+                and _YT_ID_CHARS.issuperset(yt_id)
+                and text[pos + 11 : pos + 12] not in _YT_ID_CHARS
+            ):
+                best = (start, yt_id)
+                break
+            start = text.find(prefix, pos)
+    if best:
+        return best[1]
 
 
 class iYTDL(Extractor, Downloader, Uploader):
+    __slots__ = (
+        "yt_link_regex",
+        "default_thumb",
+        "_session",
+        "http",
+        "cache",
+        "loop",
+        "_loop",
+        "download_path",
+        "log_group_id",
+        "external_downloader",
+        "delete_file_after_upload",
+        "_ffmpeg",
+        "_ffprobe",
+        "_thumb_sem",
+    )
+    # ffmpeg location -> working ffprobe (if any), checked once per process
+    _ffmpeg_checked: Dict[str, Union[Path, str, None]] = {}
+
     def __init__(
         self,
         log_group_id: Union[int, str],
@@ -45,31 +112,39 @@ class iYTDL(Extractor, Downloader, Uploader):
             - session (`Optional[ClientSession]`, optional): Aiohttp ClientSession. (Defaults to `None`)
             - silent (`bool`, optional): Disable youtube_dl stdout. (Defaults to `False`)
             - download_path (`str`, optional): Custom download location. (Defaults to `"downloads"`)
-            - loop (`Optional[asyncio.AbstractEventLoop]`, optional): Event loop. (Defaults to `None`)
+            - loop (`Optional[asyncio.AbstractEventLoop]`, optional): Event loop, running loop is used if not given. (Defaults to `None`)
             - default_thumb (`str`, optional): Fallback thumbnail. (Defaults to `"https://i.imgur.com/4LwPLai.png"`)
             - cache_path (`str`, optional): Path to store cache. (Defaults to `""`)
             - delete_media: (`bool`, optional): Delete media from local storage after uploading on Telegram. (Defaults to `False`)
             - external_downloader: (`Optional[types.ExternalDownloader]`, optional): External Downloader e.g `types.external_downloader.Aria2c`. (Defaults to `None`)
             - ffmpeg_location (`str`, optional): Custom location for FFMPEG. (Defaults to `"ffmpeg"`)
         """
-        self.yt_link_regex = re.compile(
-            r"(?:youtube(?:-nocookie)?\.com|youtu\.be)/(?:[\w-]+\?v=|embed/|v/|shorts/)?([\w-]{11})"
-        )
-        self.generic_url_regex = re.compile(r"^https?://\S+")
+        self.yt_link_regex = _YT_LINK_RE
         self.default_thumb = default_thumb
-        self.http = session or ClientSession()
+        self._session = session
+        # Created in start() to bind it to the running loop
+        self.http: Optional[ClientSession] = None
+        self._thumb_sem: Optional[asyncio.Semaphore] = None
         _cache_path = Path(cache_path)
-        _cache_path.mkdir(exist_ok=True, parents=True)
+        if not _cache_path.exists():
+            _cache_path.mkdir(parents=True, exist_ok=True)
         if _cache_path.is_file():
             raise TypeError(f"'{cache_path}' expected a Directory got a File instead")
         self.cache = AioSQLiteDB(
             _cache_path.joinpath("yt_search_cache.db"), clean=False
         )
-        self.loop = loop or asyncio.get_event_loop()
+        # Running loop is picked in start()
+        self._loop = loop
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
         self.download_path = Path(download_path)
         self.log_group_id = log_group_id
 
-        self.download_path.mkdir(exist_ok=True, parents=True)
+        if not self.download_path.exists():
+            self.download_path.mkdir(parents=True, exist_ok=True)
+        if self.download_path.is_file():
+            raise TypeError(
+                f"'{download_path}' expected a Directory got a File instead"
+            )
         self.external_downloader = external_downloader
         self.delete_file_after_upload = delete_media
         if ffmpeg_location != "ffmpeg":
@@ -89,7 +164,7 @@ class iYTDL(Extractor, Downloader, Uploader):
             - session (`Optional[ClientSession]`, optional): Aiohttp ClientSession. (Defaults to `None`)
             - silent (`bool`, optional): Disable youtube_dl stdout. (Defaults to `False`)
             - download_path (`str`, optional): Custom download location. (Defaults to `"downloads"`)
-            - loop (`Optional[asyncio.AbstractEventLoop]`, optional): Event loop. (Defaults to `None`)
+            - loop (`Optional[asyncio.AbstractEventLoop]`, optional): Event loop, running loop is used if not given. (Defaults to `None`)
             - default_thumb (`str`, optional): Fallback thumbnail. (Defaults to `"https://i.imgur.com/4LwPLai.png"`)
             - cache_path (`str`, optional): Path to store cache. (Defaults to `""`)
             - delete_media: (`bool`, optional): Delete media from local storage after uploading on Telegram. (Defaults to `False`)
@@ -115,12 +190,43 @@ class iYTDL(Extractor, Downloader, Uploader):
         -------
             `Optional[types.SearhResult]`: If key exist in cache.
         """
-        if len(key) == 11:
+        if len(key) == 11 and _YT_ID_CHARS.issuperset(key):
             # yt_id
             return await self.get_download_button(key)
         if url := await self.cache.get_url(key):
             return await self.generic_extractor(key, url)
 
+    async def get_key_from_url(self, url: str) -> Optional[str]:
+        """Classify URL in a single pass and get Key for `extract_info_from_key`
+
+        Parameters:
+        ----------
+            - url (`str`): YouTube or any other Http URL.
+
+        Returns:
+        -------
+            `Optional[str]`: YouTube video ID or Unique Key of saved URL
+        """
+        if yt_id := _extract_yt_id(url):
+            return yt_id
+        if is_url(url):
+            return await self.cache.save_url(url)
+
+    @staticmethod
+    def get_yt_id(text: str) -> Optional[str]:
+        """Get YouTube video ID from a link in text,
+        faster alternative to `yt_link_regex.search(text).group(1)`
+
+        Parameters:
+        ----------
+            - text (`str`): Text containing YouTube link.
+
+        Returns:
+        -------
+            `Optional[str]`: YouTube video ID if found
+        """
+        return _extract_yt_id(text)
+
     async def get_ytthumb(self, yt_id: str) -> str:
         """Get YouTube video thumbnail from video ID
 
@@ -132,22 +238,53 @@ class iYTDL(Extractor, Downloader, Uploader):
         -------
             `str`: Thumbnail URL
         """
-        for quality in (
-            "maxresdefault",
-            "hqdefault",
-            "sddefault",
-            "mqdefault",
-            "default",
+        if self._thumb_sem is None:
+            raise RuntimeError("iYTDL is not started, call start() first")
+        if thumb := await self.cache.get_thumb(yt_id):
+            return thumb
+        links = [
+            f"https://i.ytimg.com/vi/{yt_id}/{quality}.jpg"
+            for quality in _YT_THUMB_QUALITIES
+        ]
+        # Each lookup sends one probe per quality, stay within per host limit
+        async with self._thumb_sem:
+            results = await asyncio.gather(
+                *map(self._thumb_exists, links), return_exceptions=True
+            )
+        # Links are ordered by quality, pick the best one that exists
+        if thumb := next(
+            (link for link, found in zip(links, results) if found is True), None
         ):
-            link = f"https://i.ytimg.com/vi/{yt_id}/{quality}.jpg"
-            async with self.http.get(link) as resp:
-                if resp.status == 200:
-                    break
-        else:
-            link = self.default_thumb
-        return link
+            await self.cache.save_thumb(yt_id, thumb)
+            return thumb
+        return self.default_thumb
+
+    async def get_ytthumbs(self, yt_ids: List[str]) -> List[str]:
+        """Get YouTube video thumbnails for multiple video IDs concurrently
+
+        Parameters:
+        ----------
+            - yt_ids (`List[str]`): YouTube video IDs.
+
+        Returns:
+        -------
+            `List[str]`: Thumbnail URLs in the same order
+        """
+        return list(await asyncio.gather(*map(self.get_ytthumb, yt_ids)))
+
+    async def _thumb_exists(self, link: str) -> bool:
+        resp = await self.http.head(link, allow_redirects=True)
+        try:
+            return resp.status == 200
+        finally:
+            # No body to read, hand the connection back to the pool
+            resp.release()
 
     async def _check_ffmpeg(self) -> None:
+        if (ffmpeg_key := str(self._ffmpeg)) in iYTDL._ffmpeg_checked:
+            if ffprobe := iYTDL._ffmpeg_checked[ffmpeg_key]:
+                setattr(self, "_ffprobe", ffprobe)
+            return
         if isinstance(self._ffmpeg, Path):
             ffmpeg = self._ffmpeg
             _ffprobe = self._ffmpeg.parent.joinpath(
@@ -157,13 +294,19 @@ class iYTDL(Extractor, Downloader, Uploader):
         else:
             ffmpeg = "ffmpeg"
             ffprobe = "ffprobe"
-        out_1 = await run_command(f"{ffmpeg} -version", shell=True)
+        out_1, out_2 = await asyncio.gather(
+            run_command(str(ffmpeg), "-version"),
+            run_command(str(ffprobe), "-version", silent=True)
+            if ffprobe is not None
+            else asyncio.sleep(0),
+        )
         if out_1[1] != 0:
             raise ValueError(f"'{ffmpeg}' was not Found !")
-        if ffprobe is not None:
-            out_2 = await run_command(f"{ffprobe} -version", shell=True, silent=True)
-            if out_2[1] == 0:
-                setattr(self, "_ffprobe", ffprobe)
+        if out_2 is not None and out_2[1] == 0:
+            setattr(self, "_ffprobe", ffprobe)
+        else:
+            ffprobe = None
+        iYTDL._ffmpeg_checked[ffmpeg_key] = ffprobe
 
     async def stop(self) -> None:
         """Stop iYTDL instance manually or Use Context Manager"""
@@ -173,6 +316,22 @@ class iYTDL(Extractor, Downloader, Uploader):
 
     async def start(self) -> None:
         """Start iYTDL instance manually or Use Context Manager"""
+        self.loop = self._loop or asyncio.get_running_loop()
+        self._thumb_sem = asyncio.Semaphore(_LIMIT_PER_HOST // len(_YT_THUMB_QUALITIES))
+        if self.http is None or self.http.closed:
+            # Caller's session can't be reused once closed e.g by stop()
+            self.http = (
+                self._session
+                if self._session and not self._session.closed
+                else ClientSession(
+                    connector=TCPConnector(
+                        limit=100,
+                        limit_per_host=_LIMIT_PER_HOST,
+                        ttl_dns_cache=300,
+                        keepalive_timeout=75,
+                    )
+                )
+            )
         await self._check_ffmpeg()
         await self.cache._init()
 
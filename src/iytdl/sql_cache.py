@@ -23,9 +23,15 @@ class AioSQLiteDB:
             clean (`bool`, optional): Delete old cache and create new. (Defaults to `False`)
 
         """
-        if clean and os.path.isfile(db_name):
-            os.remove(db_name)
         self.db_name = db_name
+        if clean:
+            self._remove_db()
+
+    def _remove_db(self) -> None:
+        """Delete Cache file along with its WAL files"""
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.isfile(path := f"{self.db_name}{suffix}"):
+                os.remove(path)
 
     async def _init(self) -> None:
         """Async init"""
@@ -33,9 +39,17 @@ class AioSQLiteDB:
             self.con = await aiosqlite.connect(self.db_name)
         except aiosqlite.OperationalError:
             # DB is corrupt
-            if os.path.isfile(self.db_name):
-                os.remove(self.db_name)
+            self._remove_db()
             self.con = await aiosqlite.connect(self.db_name)
+        # WAL lets reads run alongside writes and batches fsyncs
+        async with self.con.executescript(
+            """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;"""
+        ):
+            pass
         self.cur = await self.con.cursor()
         await self.__init_tables()
 
@@ -47,6 +61,14 @@ CREATE TABLE IF NOT EXISTS url_cache (
     key TEXT NOT NULL UNIQUE,
     url TEXT,
     PRIMARY KEY(key)
+);"""
+        )
+        await self.cur.execute(
+            """
+CREATE TABLE IF NOT EXISTS thumb_cache (
+    yt_id TEXT NOT NULL UNIQUE,
+    url TEXT,
+    PRIMARY KEY(yt_id)
 );"""
         )
         await self.con.commit()
@@ -159,6 +181,43 @@ CREATE TABLE IF NOT EXISTS {key} (
         if value := await self.cur.fetchone():
             return value[0]
 
+    async def save_thumb(self, yt_id: str, url: str) -> None:
+        """Save resolved Thumbnail URL of a YouTube video
+
+        Parameters:
+        ----------
+            yt_id (`str`): YouTube video ID.
+
+            url (`str`): Thumbnail URL.
+
+        """
+        async with self.con.execute(
+            "INSERT OR REPLACE INTO thumb_cache(yt_id, url) VALUES(?, ?)",
+            (yt_id, url),
+        ):
+            pass
+        await self.con.commit()
+
+    async def get_thumb(self, yt_id: str) -> Optional[str]:
+        """Get Saved Thumbnail URL from YouTube video ID
+
+        Parameters:
+        ----------
+            yt_id (`str`): YouTube video ID.
+
+        Returns:
+        -------
+            Optional[str]: Thumbnail URL if found
+
+        """
+        # Own cursor, as thumbnails are resolved concurrently
+        async with self.con.execute(
+            "SELECT url FROM thumb_cache WHERE yt_id = ?", (yt_id,)
+        ) as cur:
+            value = await cur.fetchone()
+        if value:
+            return value[0]
+
     async def close(self) -> None:
         """Close Cache File"""
         await self.con.close()
@@ -29,6 +29,8 @@ logger = logging.getLogger(__name__)
 
 
 class Uploader:
+    __slots__ = ()
+
     @run_sync
     def find_media(
         self, key: str, media_type: Literal["audio", "video"]
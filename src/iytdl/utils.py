@@ -5,6 +5,7 @@ __all__ = [
     "time_formater",
     "rnd_key",
     "run_command",
+    "is_url",
 ]
 
 import asyncio
@@ -101,6 +102,15 @@ def rnd_key(length: int = 8) -> str:
     return "".join(sample(_CHAR, length))
 
 
+def is_url(text: str) -> bool:
+    """Check if text is a Http URL"""
+    # Same as `^https?://\S+`, scheme must be followed by a non-whitespace char
+    return (
+        text.startswith(("http://", "https://"))
+        and text.partition("://")[2][:1].strip() != ""
+    )
+
+
 async def upload_to_telegraph(http: ClientSession, url: str) -> Optional[str]:
     """Upload Images to Telegra.ph via URL
 
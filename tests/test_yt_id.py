@@ -0,0 +1,50 @@
+import random
+import string
+
+from iytdl import iYTDL
+from iytdl.main import _YT_LINK_RE
+
+
+# Test that the regex-free YouTube ID scanner agrees with `yt_link_regex`
+
+_PIECES = (
+    "youtube.com/watch?v=",
+    "youtube-nocookie.com/embed/",
+    "youtube.com/shorts/",
+    "youtube.com/v/",
+    "youtu.be/",
+    "https://www.",
+    "dQw4w9WgXcQ",
+    "AseAyévbtek",
+)
+_CHARS = string.ascii_letters + string.digits + "-_ /.?=&éß٣Ａ"
+
+
+def regex_yt_id(text):
+    if match := _YT_LINK_RE.search(text):
+        return match.group(1)
+
+
+def test_known_links():
+    for text, yt_id in (
+        ("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+        ("look https://youtu.be/dQw4w9WgXcQ?t=42", "dQw4w9WgXcQ"),
+        ("youtube.com/shorts/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+        ("youtube-nocookie.com/embed/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+        ("youtube.com/watch?v=dQw4w9WgXcQQ", None),
+        ("youtube.com/watch?v=dQw4w9WgXcQé", "dQw4w9WgXcQ"),
+        ("youtu.be/AseAyévbtek", None),
+        ("https://example.com", None),
+    ):
+        assert iYTDL.get_yt_id(text) == yt_id
+        assert regex_yt_id(text) == yt_id
+
+
+def test_scanner_matches_regex():
+    rnd = random.Random(0)
+    for _ in range(50000):
+        text = "".join(
+            rnd.choice(_PIECES) if rnd.random() < 0.5 else rnd.choice(_CHARS)
+            for _ in range(rnd.randint(0, 12))
+        )
+        assert iYTDL.get_yt_id(text) == regex_yt_id(text), text